@@ -1,16 +1,32 @@
 import atexit
+import os
 import signal
 import subprocess
 import sys
 
+from .langtools.analysis import load_endpoints
+from .langtools.langtools_daemon_client import LOCAL_HOSTS, parse_endpoint
+from .langtools.settings import DaemonClientSettings
 from .server import mcp
 
 
-def start_langtools_daemon():
+def find_local_endpoint() -> tuple[str, int] | None:
+    for endpoint in load_endpoints(DaemonClientSettings()):
+        host, port = parse_endpoint(endpoint)
+        if host in LOCAL_HOSTS:
+            return host, port
+    return None
+
+
+def start_langtools_daemon(host: str, port: int):
+    # Pin the sidecar to the endpoint the client will use, regardless of any
+    # LANGTOOLSD_HOST/LANGTOOLSD_PORT exported into the MCP's environment.
+    env = {**os.environ, "LANGTOOLSD_HOST": host, "LANGTOOLSD_PORT": str(port)}
     proc = subprocess.Popen(
         [sys.executable, "-u", "-m", "langtools_mcp.langtools_daemon.main"],
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
+        env=env,
     )
 
     def cleanup():
@@ -32,8 +48,12 @@ def start_langtools_daemon():
     return proc
 
 def main():
-    print("Starting langtools_daemon sidecar...")
-    _daemon_proc = start_langtools_daemon()
+    local = find_local_endpoint()
+    if local is None:
+        print("No local daemon endpoint configured, skipping sidecar...")
+    else:
+        print("Starting langtools_daemon sidecar...")
+        _daemon_proc = start_langtools_daemon(*local)
     mcp.run()
 
 
@@ -1,6 +1,63 @@
+import logging
+import threading
+
 from langtools_mcp.langtools.langtools_daemon_client import LangtoolsDaemonClient
+from langtools_mcp.langtools.settings import DaemonClientSettings
+
+logger = logging.getLogger(__name__)
+
+_client: LangtoolsDaemonClient | None = None
+_client_lock = threading.Lock()
+
+
+def load_endpoints(
+    settings: DaemonClientSettings, current: list[str] | None = None
+) -> list[str]:
+    """
+    Return the configured daemon endpoints.
+    ENDPOINTS_FILE wins when set; blank lines and `#` comments are skipped. If the
+    file cannot be read or lists nothing (e.g. mid-rewrite), `current` membership
+    is kept so the ring does not move, and ENDPOINTS is used only on first load.
+    """
+    if settings.ENDPOINTS_FILE:
+        try:
+            with open(settings.ENDPOINTS_FILE) as f:
+                lines = [line.split("#", 1)[0].strip() for line in f]
+        except OSError as e:
+            logger.warning(f"Unable to read {settings.ENDPOINTS_FILE}: {e}")
+        else:
+            endpoints = [line for line in lines if line]
+            if endpoints:
+                return endpoints
+            logger.warning(f"{settings.ENDPOINTS_FILE} lists no endpoints")
+        if current:
+            return current
+    return settings.ENDPOINTS
+
+
+def get_daemon_client() -> LangtoolsDaemonClient:
+    """
+    Return the shared client, rebalancing it if the configured endpoints changed.
+    The client is shared so endpoint health learned on one request carries to the next.
+    """
+    global _client
+    settings = DaemonClientSettings()
+    with _client_lock:
+        endpoints = load_endpoints(
+            settings, _client.endpoints if _client is not None else None
+        )
+        if _client is None:
+            _client = LangtoolsDaemonClient(
+                endpoints=endpoints,
+                timeout=settings.TIMEOUT,
+                connect_timeout=settings.CONNECT_TIMEOUT,
+                health_check_interval=settings.HEALTH_CHECK_INTERVAL,
+            )
+        elif set(endpoints) != set(_client.endpoints):
+            logger.info(f"Daemon endpoints changed, rebalancing onto {endpoints}")
+            _client.rebalance(endpoints)
+    return _client
 
 
 def run_analysis_for_language(language: str, project_root: str) -> dict:
-    client = LangtoolsDaemonClient()
-    return client.analyze(language, project_root)
+    return get_daemon_client().analyze(language, project_root)
@@ -1,13 +1,180 @@
+import bisect
+import hashlib
 import http.client
 import json
+import logging
+import os
+import threading
+import time
+from typing import Iterable, Iterator
 
 SUPPORTED_LANGUAGES = ["go", "python"]
 
+DEFAULT_ENDPOINT = "localhost:61782"
+# The daemon's HTTPServer is IPv4 only, so IPv6 loopback is deliberately absent.
+LOCAL_HOSTS = {"localhost", "127.0.0.1"}
+
+logger = logging.getLogger(__name__)
+
+
+class NoHealthyDaemonException(Exception): ...
+
+
+class InvalidEndpointException(ValueError):
+    """The configured daemon endpoints are malformed."""
+
+
+class DaemonUnavailableError(Exception):
+    """A single daemon could not be reached or sent back an unusable reply."""
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], "big")
+
+
+def parse_endpoint(endpoint: str) -> tuple[str, int]:
+    host, sep, port = endpoint.rpartition(":")
+    if not sep or not host or not port.isdigit():
+        raise InvalidEndpointException(f"Invalid daemon endpoint {endpoint!r}, expected host:port")
+    return host, int(port)
+
+
+class HashRing:
+    """
+    Consistent hash ring mapping keys onto nodes.
+    Each node is placed on the ring `replicas` times so keys spread evenly,
+    and adding or removing a node only moves the keys adjacent to its points.
+    """
+
+    def __init__(self, nodes: Iterable[str] = (), replicas: int = 100):
+        self.replicas = replicas
+        self._keys: list[int] = []
+        self._ring: dict[int, str] = {}
+        for node in nodes:
+            self.add(node)
+
+    @property
+    def nodes(self) -> list[str]:
+        return list(dict.fromkeys(self._ring[k] for k in self._keys))
+
+    def add(self, node: str):
+        for i in range(self.replicas):
+            point = _hash(f"{node}#{i}")
+            if point in self._ring:
+                continue
+            self._ring[point] = node
+            bisect.insort(self._keys, point)
+
+    def remove(self, node: str):
+        for i in range(self.replicas):
+            point = _hash(f"{node}#{i}")
+            if self._ring.get(point) == node:
+                del self._ring[point]
+                self._keys.remove(point)
+
+    def preference_list(self, key: str) -> list[str]:
+        """
+        Return every node ordered by preference for `key`: the owning node first,
+        followed by the next distinct nodes clockwise around the ring.
+        """
+        if not self._keys:
+            return []
+        start = bisect.bisect(self._keys, _hash(key))
+        ordered: dict[str, None] = {}
+        for i in range(len(self._keys)):
+            ordered.setdefault(self._ring[self._keys[(start + i) % len(self._keys)]])
+        return list(ordered)
+
+    def get(self, key: str) -> str | None:
+        nodes = self.preference_list(key)
+        return nodes[0] if nodes else None
+
 
 class LangtoolsDaemonClient:
-    def __init__(self, host="localhost", port=61782):
-        self.host = host
-        self.port = port
+    """
+    Client for one or more langtools daemons.
+    Requests are routed by `project_root` over a consistent hash ring so each
+    daemon keeps its caches and warm servers for the same roots. Daemons that
+    cannot be reached are marked down and tried last; once
+    `health_check_interval` has passed they are probed on `/health` before
+    being given real work again.
+    """
+
+    def __init__(
+        self,
+        endpoints: Iterable[str] = (DEFAULT_ENDPOINT,),
+        timeout: float = 60,
+        connect_timeout: float = 5,
+        health_check_interval: float = 30,
+    ):
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.health_check_interval = health_check_interval
+        self.ring = HashRing()
+        self._down: dict[str, float] = {}
+        # Guards both the ring and the down marks; never held across network I/O.
+        self._lock = threading.Lock()
+        for endpoint in endpoints:
+            self.add_endpoint(endpoint)
+
+    @property
+    def endpoints(self) -> list[str]:
+        with self._lock:
+            return self.ring.nodes
+
+    def add_endpoint(self, endpoint: str):
+        parse_endpoint(endpoint)
+        with self._lock:
+            self.ring.add(endpoint)
+
+    def remove_endpoint(self, endpoint: str):
+        with self._lock:
+            self.ring.remove(endpoint)
+            self._down.pop(endpoint, None)
+
+    def rebalance(self, endpoints: Iterable[str]):
+        """
+        Replace the ring membership with `endpoints`.
+        Only roots owned by nodes that joined or left change owner.
+        """
+        wanted = list(dict.fromkeys(endpoints))
+        for endpoint in wanted:
+            parse_endpoint(endpoint)
+        if not wanted:
+            raise InvalidEndpointException("At least one daemon endpoint is required")
+        with self._lock:
+            for endpoint in self.ring.nodes:
+                if endpoint not in wanted:
+                    self.ring.remove(endpoint)
+                    self._down.pop(endpoint, None)
+            for endpoint in wanted:
+                self.ring.add(endpoint)
+
+    def endpoint_for(self, project_root: str) -> str | None:
+        with self._lock:
+            return self.ring.get(self._routing_key(project_root))
+
+    def is_healthy(self, endpoint: str) -> bool:
+        try:
+            status, body = self._request(
+                endpoint, "GET", "/health", timeout=self.connect_timeout
+            )
+        except (DaemonUnavailableError, TimeoutError):
+            return False
+        return (
+            status == 200 and isinstance(body, dict) and body.get("status") == "ok"
+        )
+
+    def check_health(self) -> dict[str, bool]:
+        results = {}
+        for endpoint in self.endpoints:
+            healthy = self.is_healthy(endpoint)
+            if healthy:
+                self._mark_up(endpoint)
+            else:
+                self._mark_down(endpoint)
+            results[endpoint] = healthy
+        return results
 
     def validate_language(self, language: str):
         if language not in SUPPORTED_LANGUAGES:
@@ -17,11 +184,101 @@ class LangtoolsDaemonClient:
 
     def analyze(self, language: str, project_root: str):
         self.validate_language(language)
-        conn = http.client.HTTPConnection(self.host, self.port, timeout=60)
         data = json.dumps({"language": language, "project_root": project_root})
-        conn.request(
-            "POST", "/", body=data, headers={"Content-Type": "application/json"}
+        with self._lock:
+            candidates = self.ring.preference_list(self._routing_key(project_root))
+        for endpoint in self._candidates(candidates):
+            try:
+                _, body = self._request(endpoint, "POST", "/", body=data)
+            except DaemonUnavailableError as e:
+                logger.warning(f"Daemon {endpoint} unavailable, failing over: {e}")
+                self._mark_down(endpoint)
+                continue
+            self._mark_up(endpoint)
+            return body
+        raise NoHealthyDaemonException(
+            f"No langtools daemon reachable for project_root {project_root!r}"
         )
-        resp = conn.getresponse()
-        resp_data = resp.read()
-        return json.loads(resp_data)
+
+    def _routing_key(self, project_root: str) -> str:
+        return os.path.normpath(os.path.abspath(project_root))
+
+    def _mark_down(self, endpoint: str):
+        with self._lock:
+            self._down[endpoint] = time.monotonic()
+
+    def _mark_up(self, endpoint: str):
+        with self._lock:
+            self._down.pop(endpoint, None)
+
+    def _candidates(self, endpoints: list[str]) -> Iterator[str]:
+        """
+        Yield `endpoints` in preference order, skipping past nodes marked down.
+        A node whose `health_check_interval` has expired is probed on `/health`
+        only when iteration reaches it, so a request served by an earlier node
+        never waits on a dead one. Nodes still marked down are yielded last
+        rather than dropped, so a request can succeed even if every node has
+        been flagged.
+        """
+        deferred = []
+        for endpoint in endpoints:
+            with self._lock:
+                marked = self._down.get(endpoint)
+                expired = (
+                    marked is not None
+                    and time.monotonic() - marked >= self.health_check_interval
+                )
+                if expired:
+                    # Claim the probe by restarting the interval, so concurrent
+                    # requests defer this node instead of probing it too.
+                    self._down[endpoint] = time.monotonic()
+            if marked is None:
+                yield endpoint
+            elif expired and self.is_healthy(endpoint):
+                self._mark_up(endpoint)
+                yield endpoint
+            else:
+                deferred.append(endpoint)
+        yield from deferred
+
+    def _request(
+        self,
+        endpoint: str,
+        method: str,
+        path: str,
+        body: str | None = None,
+        timeout: float | None = None,
+    ) -> tuple[int, dict]:
+        """
+        Send one request to `endpoint`.
+        Failing to connect, or getting a reply that is not JSON over HTTP, raises
+        DaemonUnavailableError. A timeout while waiting on the response is
+        re-raised as TimeoutError: the daemon is up, the analysis is just slow.
+        """
+        host, port = parse_endpoint(endpoint)
+        conn = http.client.HTTPConnection(host, port, timeout=self.connect_timeout)
+        try:
+            try:
+                conn.connect()
+            except OSError as e:
+                raise DaemonUnavailableError(f"connect to {endpoint} failed: {e}")
+            conn.sock.settimeout(self.timeout if timeout is None else timeout)
+            try:
+                conn.request(
+                    method,
+                    path,
+                    body=body,
+                    headers={"Content-Type": "application/json"},
+                )
+                resp = conn.getresponse()
+                resp_data = resp.read()
+            except TimeoutError:
+                raise
+            except (OSError, http.client.HTTPException) as e:
+                raise DaemonUnavailableError(f"request to {endpoint} failed: {e!r}")
+        finally:
+            conn.close()
+        try:
+            return resp.status, json.loads(resp_data)
+        except json.JSONDecodeError as e:
+            raise DaemonUnavailableError(f"invalid JSON from {endpoint}: {e}")
@@ -50,6 +50,34 @@ class GoToolSettings(BaseSettings):
     )
 
 
+class DaemonClientSettings(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="LANGTOOLSD_")
+    ENDPOINTS: list[str] = Field(
+        description="Daemon endpoints as host:port. Project roots are sharded across them by consistent hashing",
+        default=["localhost:61782"],
+    )
+
+    ENDPOINTS_FILE: str | None = Field(
+        description="File listing daemon endpoints, one host:port per line. Re-read on every request so nodes can join or leave without restarting. Takes precedence over ENDPOINTS; if it is unreadable or empty the last membership is kept",
+        default=None,
+    )
+
+    TIMEOUT: float = Field(
+        description="Timeout in seconds waiting on an analysis response from a daemon",
+        default=60,
+    )
+
+    CONNECT_TIMEOUT: float = Field(
+        description="Timeout in seconds to connect to a daemon or answer a health check. Exceeding it fails over to the next daemon",
+        default=5,
+    )
+
+    HEALTH_CHECK_INTERVAL: float = Field(
+        description="Seconds an unreachable endpoint is deprioritised before it is probed on /health and trusted with work again",
+        default=30,
+    )
+
+
 if __name__ == "__main__":
     os.environ["LANGTOOLS_PYTHON_TOOLS"] = '["ruff"]'
     settings = Settings()
@@ -1,7 +1,7 @@
 import json
 import logging
 import os
-from http.server import BaseHTTPRequestHandler, HTTPServer
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 from langtools_mcp.langtools.strategies import LANGUAGE_STRATEGIES
 from langtools_mcp.logger import setup_logging
@@ -20,6 +20,15 @@ class LangtoolsDaemonHandler(BaseHTTPRequestHandler):
         self.end_headers()
         self.wfile.write(json.dumps({"status": "fail", "error": message}).encode())
 
+    def do_GET(self):
+        if self.path != "/health":
+            self.send_error_json(404, f"Unknown path: {self.path}")
+            return
+        self.send_response(200)
+        self.send_header("Content-type", "application/json")
+        self.end_headers()
+        self.wfile.write(json.dumps({"status": "ok"}).encode())
+
     def do_POST(self):
         try:
             length = int(self.headers.get("Content-Length", 0))
@@ -53,7 +62,7 @@ def run():
     host = os.getenv("LANGTOOLSD_HOST", HOST)
     port = int(os.getenv("LANGTOOLSD_PORT", PORT))
     server_address = (host, port)
-    httpd = HTTPServer(server_address, LangtoolsDaemonHandler)
+    httpd = ThreadingHTTPServer(server_address, LangtoolsDaemonHandler)
     logger.info(f"Langtools Daemon started on {host}:{port}")
     try:
         httpd.serve_forever()
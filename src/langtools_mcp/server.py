@@ -3,10 +3,14 @@ from typing import Literal
 
 from mcp.server.fastmcp import FastMCP
 from mcp.shared.exceptions import McpError
-from mcp.types import INVALID_REQUEST, ErrorData
+from mcp.types import INTERNAL_ERROR, INVALID_REQUEST, ErrorData
 from pydantic import BaseModel
 
 from langtools_mcp.langtools.analysis import run_analysis_for_language
+from langtools_mcp.langtools.langtools_daemon_client import (
+    InvalidEndpointException,
+    NoHealthyDaemonException,
+)
 from langtools_mcp.logger import setup_logging
 
 setup_logging()
@@ -38,8 +42,24 @@ def analyze_codebase(params: AnalyzeFileParams):
         analysis_result = run_analysis_for_language(
             language=params.language, project_root=params.project_root
         )
+    except InvalidEndpointException as e:
+        raise McpError(
+            ErrorData(
+                message=f"langtools daemon endpoints are misconfigured: {e}",
+                code=INTERNAL_ERROR,
+            )
+        )
     except ValueError as e:
         raise McpError(ErrorData(message=str(e), code=INVALID_REQUEST))
     except NotImplementedError as e:
         raise McpError(ErrorData(message=str(e), code=INVALID_REQUEST))
+    except NoHealthyDaemonException as e:
+        raise McpError(ErrorData(message=str(e), code=INTERNAL_ERROR))
+    except TimeoutError:
+        raise McpError(
+            ErrorData(
+                message=f"Analysis of {params.project_root} timed out waiting on the langtools daemon",
+                code=INTERNAL_ERROR,
+            )
+        )
     return analysis_result
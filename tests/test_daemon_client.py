@@ -0,0 +1,271 @@
+import http.client
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from langtools_mcp.langtools import analysis
+from langtools_mcp.langtools.langtools_daemon_client import (
+    LangtoolsDaemonClient,
+    NoHealthyDaemonException,
+)
+from langtools_mcp.langtools.strategies import AnalysisResponse, Diagnostic
+from langtools_mcp.langtools_daemon import main as daemon_main
+
+ROOTS = [f"/srv/projects/proj{i}" for i in range(50)]
+
+
+class FakeStrategy:
+    delay = 0.0
+
+    def __init__(self, project_root: str):
+        self.project_root = project_root
+
+    def analyze(self):
+        time.sleep(self.delay)
+        return AnalysisResponse(
+            status="ok",
+            diagnostics=[
+                Diagnostic(status="ok", source="fake", output=self.project_root)
+            ],
+        )
+
+
+class RecordingHandler(daemon_main.LangtoolsDaemonHandler):
+    def do_POST(self):
+        self.server.served.append(self.server.server_port)
+        super().do_POST()
+
+    def log_message(self, format, *args): ...
+
+
+class Daemon:
+    def __init__(self, handler=RecordingHandler):
+        self.httpd = ThreadingHTTPServer(("localhost", 0), handler)
+        self.httpd.daemon_threads = True
+        self.httpd.served = []
+        self.endpoint = f"localhost:{self.httpd.server_port}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    @property
+    def served(self) -> list[int]:
+        return self.httpd.served
+
+    def kill(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def daemons(monkeypatch):
+    monkeypatch.setitem(daemon_main.LANGUAGE_STRATEGIES, "python", FakeStrategy)
+    running = [Daemon() for _ in range(3)]
+    yield running
+    for daemon in running:
+        try:
+            daemon.kill()
+        except OSError:
+            pass
+
+
+def make_client(daemons, **kwargs) -> LangtoolsDaemonClient:
+    kwargs.setdefault("connect_timeout", 1)
+    return LangtoolsDaemonClient(endpoints=[d.endpoint for d in daemons], **kwargs)
+
+
+def by_endpoint(daemons) -> dict:
+    return {d.endpoint: d for d in daemons}
+
+
+def test_health_endpoint(daemons):
+    conn = http.client.HTTPConnection("localhost", daemons[0].httpd.server_port)
+    conn.request("GET", "/health")
+    resp = conn.getresponse()
+    assert resp.status == 200
+    assert json.loads(resp.read()) == {"status": "ok"}
+
+    conn.request("GET", "/other")
+    resp = conn.getresponse()
+    assert resp.status == 404
+    assert json.loads(resp.read())["status"] == "fail"
+
+
+def test_routes_each_root_to_its_owner(daemons):
+    client = make_client(daemons)
+    nodes = by_endpoint(daemons)
+    for root in ROOTS:
+        owner = nodes[client.endpoint_for(root)]
+        served = len(owner.served)
+        result = client.analyze("python", root)
+        assert result["diagnostics"][0]["output"] == root
+        assert len(owner.served) == served + 1
+    assert all(d.served for d in daemons)
+
+
+def test_fails_over_when_daemon_killed(daemons):
+    client = make_client(daemons)
+    nodes = by_endpoint(daemons)
+    root = ROOTS[0]
+    owner = client.endpoint_for(root)
+    nodes[owner].kill()
+
+    result = client.analyze("python", root)
+
+    assert result["diagnostics"][0]["output"] == root
+    assert owner in client._down
+    fallback = client.ring.preference_list(client._routing_key(root))[1]
+    assert nodes[fallback].served
+
+
+def test_fails_over_on_connect_timeout(daemons, monkeypatch):
+    client = make_client(daemons)
+    nodes = by_endpoint(daemons)
+    root = ROOTS[0]
+    owner = client.endpoint_for(root)
+    dead_port = nodes[owner].httpd.server_port
+    real_connect = http.client.HTTPConnection.connect
+
+    def connect(self):
+        # Simulate a host that silently drops packets.
+        if self.port == dead_port:
+            raise TimeoutError("timed out")
+        return real_connect(self)
+
+    monkeypatch.setattr(http.client.HTTPConnection, "connect", connect)
+
+    result = client.analyze("python", root)
+
+    assert result["diagnostics"][0]["output"] == root
+    assert owner in client._down
+    assert not nodes[owner].served
+
+
+def test_response_timeout_is_raised_without_failover(daemons, monkeypatch):
+    monkeypatch.setattr(FakeStrategy, "delay", 1.0)
+    client = make_client(daemons, timeout=0.2)
+    root = ROOTS[0]
+
+    with pytest.raises(TimeoutError):
+        client.analyze("python", root)
+
+    assert client._down == {}
+    assert sum(len(d.served) for d in daemons) == 1
+
+
+def test_invalid_response_fails_over(daemons, monkeypatch):
+    class TextHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.send_response(200)
+            self.end_headers()
+            self.wfile.write(b"not json")
+
+        def log_message(self, format, *args): ...
+
+    broken = Daemon(TextHandler)
+    try:
+        client = make_client([broken])
+        client.add_endpoint(daemons[0].endpoint)
+        root = next(r for r in ROOTS if client.endpoint_for(r) == broken.endpoint)
+
+        result = client.analyze("python", root)
+
+        assert result["diagnostics"][0]["output"] == root
+        assert broken.endpoint in client._down
+    finally:
+        broken.kill()
+
+
+def test_raises_when_no_daemon_reachable(daemons):
+    client = make_client(daemons)
+    for daemon in daemons:
+        daemon.kill()
+    with pytest.raises(NoHealthyDaemonException):
+        client.analyze("python", ROOTS[0])
+
+
+def test_down_daemon_is_probed_before_getting_work(daemons):
+    client = make_client(daemons, health_check_interval=0)
+    nodes = by_endpoint(daemons)
+    root = ROOTS[0]
+    owner = client.endpoint_for(root)
+    client._mark_down(owner)
+
+    client.analyze("python", root)
+
+    assert owner not in client._down
+    assert nodes[owner].served
+
+
+def test_healthy_owner_never_contacts_down_daemon(daemons, monkeypatch):
+    client = make_client(daemons, health_check_interval=0)
+    nodes = by_endpoint(daemons)
+    root = ROOTS[0]
+    owner, *others = client.ring.preference_list(client._routing_key(root))
+    for endpoint in others:
+        client._mark_down(endpoint)
+    contacted = []
+    real_connect = http.client.HTTPConnection.connect
+
+    def connect(self):
+        contacted.append(f"{self.host}:{self.port}")
+        return real_connect(self)
+
+    monkeypatch.setattr(http.client.HTTPConnection, "connect", connect)
+
+    client.analyze("python", root)
+
+    assert contacted == [owner]
+    assert nodes[owner].served
+    assert set(client._down) == set(others)
+
+
+def test_check_health(daemons):
+    client = make_client(daemons)
+    daemons[1].kill()
+    assert client.check_health() == {
+        daemons[0].endpoint: True,
+        daemons[1].endpoint: False,
+        daemons[2].endpoint: True,
+    }
+    assert list(client._down) == [daemons[1].endpoint]
+
+
+def test_rebalance_on_endpoints_file_change(daemons, monkeypatch, tmp_path):
+    endpoints_file = tmp_path / "endpoints.txt"
+    endpoints_file.write_text(
+        "# build hosts\n" + "\n".join(d.endpoint for d in daemons[:2]) + "\n"
+    )
+    monkeypatch.setenv("LANGTOOLSD_ENDPOINTS_FILE", str(endpoints_file))
+    monkeypatch.setattr(analysis, "_client", None)
+
+    client = analysis.get_daemon_client()
+    assert sorted(client.endpoints) == sorted(d.endpoint for d in daemons[:2])
+    before = {root: client.endpoint_for(root) for root in ROOTS}
+
+    endpoints_file.write_text("\n".join(d.endpoint for d in daemons) + "\n")
+
+    assert analysis.get_daemon_client() is client
+    assert sorted(client.endpoints) == sorted(d.endpoint for d in daemons)
+    for root in ROOTS:
+        assert client.endpoint_for(root) in {before[root], daemons[2].endpoint}
+
+
+def test_unreadable_endpoints_file_keeps_membership(daemons, monkeypatch, tmp_path):
+    endpoints_file = tmp_path / "endpoints.txt"
+    endpoints_file.write_text("\n".join(d.endpoint for d in daemons) + "\n")
+    monkeypatch.setenv("LANGTOOLSD_ENDPOINTS_FILE", str(endpoints_file))
+    monkeypatch.setattr(analysis, "_client", None)
+
+    client = analysis.get_daemon_client()
+    before = {root: client.endpoint_for(root) for root in ROOTS}
+
+    # A non-atomic rewrite truncates the file before the new contents land.
+    endpoints_file.write_text("")
+    assert analysis.get_daemon_client() is client
+    assert sorted(client.endpoints) == sorted(d.endpoint for d in daemons)
+
+    endpoints_file.unlink()
+    assert analysis.get_daemon_client() is client
+    assert {root: client.endpoint_for(root) for root in ROOTS} == before
@@ -0,0 +1,51 @@
+from langtools_mcp.langtools.langtools_daemon_client import HashRing
+
+NODES = ["localhost:7001", "localhost:7002", "localhost:7003"]
+KEYS = [f"/srv/projects/proj{i}" for i in range(500)]
+
+
+def test_same_key_maps_to_same_node():
+    ring = HashRing(NODES)
+    other = HashRing(reversed(NODES))
+    for key in KEYS:
+        assert ring.get(key) == ring.get(key) == other.get(key)
+
+
+def test_keys_spread_across_nodes():
+    ring = HashRing(NODES)
+    owners = {ring.get(key) for key in KEYS}
+    assert owners == set(NODES)
+
+
+def test_adding_node_only_moves_keys_to_it():
+    ring = HashRing(NODES)
+    before = {key: ring.get(key) for key in KEYS}
+    ring.add("localhost:7004")
+    moved = [key for key in KEYS if ring.get(key) != before[key]]
+    assert moved
+    assert all(ring.get(key) == "localhost:7004" for key in moved)
+
+
+def test_removing_node_only_moves_its_keys():
+    ring = HashRing(NODES)
+    before = {key: ring.get(key) for key in KEYS}
+    ring.remove("localhost:7002")
+    for key in KEYS:
+        if before[key] == "localhost:7002":
+            assert ring.get(key) in {"localhost:7001", "localhost:7003"}
+        else:
+            assert ring.get(key) == before[key]
+
+
+def test_preference_list_starts_with_owner_and_covers_all_nodes():
+    ring = HashRing(NODES)
+    for key in KEYS[:20]:
+        prefs = ring.preference_list(key)
+        assert prefs[0] == ring.get(key)
+        assert sorted(prefs) == sorted(NODES)
+
+
+def test_empty_ring():
+    ring = HashRing()
+    assert ring.get("/srv/projects/proj0") is None
+    assert ring.preference_list("/srv/projects/proj0") == []
@@ -0,0 +1,32 @@
+import pytest
+from mcp.shared.exceptions import McpError
+from mcp.types import INTERNAL_ERROR, INVALID_REQUEST
+
+from langtools_mcp.langtools import analysis
+from langtools_mcp.server import AnalyzeFileParams, analyze_codebase
+
+
+@pytest.fixture(autouse=True)
+def fresh_client(monkeypatch):
+    monkeypatch.setattr(analysis, "_client", None)
+
+
+def test_misconfigured_endpoint_is_internal_error(monkeypatch):
+    monkeypatch.setenv("LANGTOOLSD_ENDPOINTS", '["no-port-here"]')
+    with pytest.raises(McpError) as exc:
+        analyze_codebase(AnalyzeFileParams(language="python", project_root="/tmp"))
+    assert exc.value.error.code == INTERNAL_ERROR
+    assert "no-port-here" in exc.value.error.message
+
+
+def test_unreachable_daemons_are_internal_error(monkeypatch):
+    monkeypatch.setenv("LANGTOOLSD_ENDPOINTS", '["127.0.0.1:1"]')
+    with pytest.raises(McpError) as exc:
+        analyze_codebase(AnalyzeFileParams(language="python", project_root="/tmp"))
+    assert exc.value.error.code == INTERNAL_ERROR
+
+
+def test_unsupported_language_is_invalid_request():
+    with pytest.raises(McpError) as exc:
+        analyze_codebase(AnalyzeFileParams(language="typescript", project_root="/tmp"))
+    assert exc.value.error.code == INVALID_REQUEST